@@ -0,0 +1,48 @@
+import sys
+import os
+import re
+import subprocess
+import statistics
+import time
+
+def bench_startup(image_folder, output_folder, runs, timeout=60):
+    # Launch label_main.py in fast-start mode and time it from before the interpreter starts
+    # until the child reports that the first frame has been painted
+    label_main = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'label_main.py')
+    timings = []
+    for _ in range(runs):
+        start = time.time()
+        try:
+            result = subprocess.run(
+                [sys.executable, label_main, image_folder, output_folder, '--benchmark'],
+                capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            print(f"Run timed out after {timeout}s.")
+            sys.exit(1)
+        match = re.search(r'First frame drawn at ([0-9.]+)', result.stdout)
+        if result.returncode != 0 or not match:
+            print(f"Run failed:\n{result.stdout}{result.stderr}")
+            sys.exit(1)
+        timings.append(float(match.group(1)) - start)
+
+    print(f"Runs: {runs}")
+    print(f"Min: {min(timings):.3f}s")
+    print(f"Median: {statistics.median(timings):.3f}s")
+    print(f"Max: {max(timings):.3f}s")
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python bench_startup.py image_folder output_folder [runs]")
+        sys.exit(1)
+
+    image_folder = sys.argv[1]
+    output_folder = sys.argv[2]
+    runs = int(sys.argv[3]) if len(sys.argv) == 4 else 10
+
+    if not os.path.isdir(image_folder):
+        print(f"Image folder not found: {image_folder}")
+        sys.exit(1)
+    if not os.path.isdir(output_folder):
+        os.makedirs(output_folder)
+
+    bench_startup(image_folder, output_folder, runs)
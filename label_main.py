@@ -1,12 +1,37 @@
+import time
+import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
+import argparse
 import os
 import json
-from typing import List, Tuple, Optional
+import queue
+import threading
+from predictions import PredictionStore
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Optional
+
+# PIL and the label server client are imported on first use to keep startup fast
+if TYPE_CHECKING:
+    from PIL import Image
+    from label_server import LabelClient
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+def find_images(image_folder: str, image_prefix: str = '', image_extension: str = '') -> List[str]:
+    # List images in the folder with optional prefix and extension filtering
+    images = []
+    for f in sorted(os.listdir(image_folder)):
+        if image_prefix and not f.startswith(image_prefix):
+            continue
+        if image_extension and not f.lower().endswith(image_extension.lower()):
+            continue
+        if f.lower().endswith(IMAGE_EXTENSIONS):
+            images.append(f)
+    return images
 
 class ImageLabeler:
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(self, master: tk.Tk, image_folder: str = '', output_folder: str = '',
+                 start_index: int = 0, image_prefix: str = '', image_extension: str = '') -> None:
         self.master = master
         self.master.title("Image Labeler")
         self.master.geometry("800x600")
@@ -27,26 +52,58 @@ class ImageLabeler:
         self.image_on_canvas = None
         self.canvas_image = None
 
-        self.original_image: Optional[Image.Image] = None
-        self.display_image: Optional[Image.Image] = None
+        self.original_image: Optional['Image.Image'] = None
+        self.display_image: Optional['Image.Image'] = None
         self.scale_x: float = 1.0
         self.scale_y: float = 1.0
 
         self.point_radius: int = 5  # Radius of the point markers
         self.dragging_point: Optional[int] = None  # Index of the point being dragged
 
+        # Optional connection to a local label server (label_server.py)
+        self.label_client: Optional['LabelClient'] = None
+        self.unsynced_frames: set = set()  # Indices of labels changed since the last server sync
+        self.auto_save_blocked: bool = False  # Set when an existing labels.json could not be read
+        # Server calls run on one background thread; results come back through a queue polled with after()
+        self.sync_jobs: 'queue.Queue[Optional[tuple]]' = queue.Queue()
+        self.sync_results: 'queue.Queue[tuple]' = queue.Queue()
+        self.sync_thread: Optional[threading.Thread] = None
+
+        # Model predictions shown as an overlay until accepted or rejected
+        self.predictions: Optional[PredictionStore] = None
+        self.current_prediction: Optional[List[List[float]]] = None
+        self.rejected_predictions: set = set()  # Frame ids whose prediction was rejected
+        # Contents of rejected_predictions.json: {dataset: {prediction file fingerprint: [frame ids]}}
+        self.rejection_log: Dict[str, Dict[str, List[str]]] = {}
+        # Predicted frames present in the folder, by decreasing confidence; rebuilt when frame ids change
+        self.review_order: Optional[List[Tuple[str, int]]] = None
+        self.review_positions: Dict[str, int] = {}
+        # Frame ids change with this option (toolbar, menu or shortcut), so the review order must be rebuilt
+        self.use_filename_as_id.trace_add('write', self.on_frame_ids_changed)
+
         # Create menu bar
         self.create_menu()
 
         # Create widgets
         self.create_widgets()
 
-        # Show welcome screen
-        self.show_welcome_screen()
+        # Called once the first frame is on screen (used by the startup benchmark)
+        self.on_first_frame: Optional[Callable[[], None]] = None
 
         # Bind events
         self.bind_events()
 
+        if image_folder:
+            # Fast start: folders came from the command line, so skip the welcome screen
+            self.image_folder = image_folder
+            self.output_folder = output_folder
+            self.image_prefix = image_prefix
+            self.image_extension = image_extension
+            self.begin_labeling(start_index, resume=True)
+        else:
+            # Show welcome screen
+            self.show_welcome_screen()
+
     def create_menu(self) -> None:
         # Create a menu bar
         self.menu_bar = tk.Menu(self.master)
@@ -61,6 +118,11 @@ class ImageLabeler:
         file_menu.add_command(label="Load Saved Labels", command=self.load_labels)
         file_menu.add_command(label="Save Labels", command=self.save_labels)
         file_menu.add_separator()
+        file_menu.add_command(label="Load Predictions", command=self.load_predictions)
+        file_menu.add_separator()
+        file_menu.add_command(label="Connect to Label Server", command=self.connect_label_server)
+        file_menu.add_command(label="Load Labels from Server", command=self.load_labels_from_server)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.on_closing)
 
         # Options menu
@@ -138,6 +200,10 @@ class ImageLabeler:
         self.master.bind('l', self.load_labels_shortcut)
         self.master.bind('<Escape>', self.on_closing)
         self.master.bind('q', self.on_closing)
+        self.master.bind('y', self.accept_prediction)
+        self.master.bind('x', self.reject_prediction)
+        self.master.bind('<period>', self.next_prediction)
+        self.master.bind('<comma>', self.prev_prediction)
 
         # Bind mouse events
         self.canvas.bind('<Button-1>', self.on_mouse_click)
@@ -145,8 +211,8 @@ class ImageLabeler:
         self.canvas.bind('<B1-Motion>', self.on_mouse_drag)
         self.canvas.bind('<ButtonRelease-1>', self.on_mouse_release)
 
-        # Bind window resize event
-        self.master.bind('<Configure>', self.on_resize)
+        # Bind canvas resize event; this also renders the first frame once the canvas is mapped
+        self.canvas.bind('<Configure>', self.on_resize)
 
     def show_welcome_screen(self) -> None:
         # Create a top-level window for the welcome screen
@@ -235,14 +301,39 @@ class ImageLabeler:
             return
 
         self.welcome_screen.destroy()
+        self.begin_labeling()
+
+    def begin_labeling(self, start_index: int = 0, resume: bool = False) -> None:
         self.load_images()
         if self.images:
-            self.image_index = 0
+            if resume:
+                self.resume_labels()
+            self.image_index = max(0, min(start_index, len(self.images) - 1))
             self.show_image()
             self.update_status(f"Loaded {len(self.images)} images.")
             self.update_progress()
-        else:
-            messagebox.showerror("Error", "No images found with the specified criteria.")
+
+    def resume_labels(self) -> None:
+        # Continue from an existing labels.json in the output folder so auto-save extends it instead of replacing it
+        save_path = os.path.join(self.output_folder, 'labels.json')
+        if not os.path.isfile(save_path):
+            return
+        try:
+            with open(save_path, 'r') as f:
+                labels = json.load(f)
+            if not isinstance(labels, list) or not all(
+                    isinstance(label, dict) and 'frame_id' in label and 'label' in label for label in labels):
+                raise ValueError("expected a list of labels")
+        except (OSError, ValueError) as e:
+            self.auto_save_blocked = True
+            messagebox.showerror(
+                "Error", f"Could not read {save_path}: {e}\nAuto-save is disabled so the file is not overwritten.")
+            return
+        # Files written with filenames as ids must be lined up by filename
+        if any(isinstance(label['frame_id'], str) for label in labels):
+            self.use_filename_as_id.set(True)
+        self.labels = self.align_labels(labels)
+        self.unsynced_frames = set(range(len(self.labels)))
 
     def select_folder(self) -> None:
         folder_selected = filedialog.askdirectory()
@@ -263,29 +354,30 @@ class ImageLabeler:
         folder_selected = filedialog.askdirectory()
         if folder_selected:
             self.output_folder = folder_selected
+            self.auto_save_blocked = False
             self.update_status(f"Set output folder: {self.output_folder}")
         else:
             messagebox.showwarning("Warning", "No output folder selected.")
 
     def load_images(self) -> None:
         # Load images from the selected folder with optional prefix and extension filtering
-        self.images = []
-        for f in sorted(os.listdir(self.image_folder)):
-            if self.image_prefix and not f.startswith(self.image_prefix):
-                continue
-            if self.image_extension and not f.lower().endswith(self.image_extension.lower()):
-                continue
-            if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-                self.images.append(f)
+        self.images = find_images(self.image_folder, self.image_prefix, self.image_extension)
         if not self.images:
             messagebox.showerror("Error", "No images found with the specified criteria.")
         else:
             # Reset labels and points when a new folder is selected
             self.labels = []
             self.points = []
+            self.unsynced_frames = set()
+            self.review_order = None
+            if self.label_client:
+                self.register_frames_on_server(self.label_client)
+            if self.predictions is not None:
+                self.load_rejected_predictions()
 
     def show_image(self) -> None:
         # Load and display the current image
+        from PIL import Image
         image_path = os.path.join(self.image_folder, self.images[self.image_index])
         self.original_image = Image.open(image_path)
         # Resize image to fit the canvas while keeping aspect ratio
@@ -299,10 +391,11 @@ class ImageLabeler:
         canvas_height = self.canvas.winfo_height()
 
         if canvas_width <= 1 or canvas_height <= 1:
-            # Canvas has not been fully initialized yet
-            self.master.after(100, self.update_image)
+            # Canvas is not mapped yet; its <Configure> event will render the image
             return
 
+        from PIL import Image, ImageTk
+
         # Calculate the scaling factor to fit the image to the canvas
         original_width, original_height = self.original_image.size
         ratio = min(canvas_width / original_width, canvas_height / original_height)
@@ -331,6 +424,11 @@ class ImageLabeler:
         # Draw the points and lines
         self.draw_polygon_and_points()
 
+        if self.on_first_frame:
+            # Report once Tk has processed the pending redraw, not when the items are queued
+            callback, self.on_first_frame = self.on_first_frame, None
+            self.master.after_idle(callback)
+
     def load_points_for_current_image(self) -> None:
         # Load points for the current image, considering copy_previous option
         # First, check if there are saved points for the current image
@@ -351,10 +449,18 @@ class ImageLabeler:
                 # Start with empty points
                 self.points = []
 
+        # Overlay the model prediction on frames without manual points
+        self.current_prediction = None
+        if self.predictions and not self.points:
+            frame_id = str(self.get_frame_id(self.image_index))
+            if frame_id not in self.rejected_predictions:
+                self.current_prediction = self.predictions.get(frame_id)
+
     def draw_polygon_and_points(self) -> None:
         # First, remove any existing points and polygons
         self.canvas.delete("point")
         self.canvas.delete("polygon")
+        self.draw_prediction()
 
         if not self.points:
             return
@@ -386,6 +492,35 @@ class ImageLabeler:
                 self.canvas.create_line(
                     x1, y1, x2, y2, fill='#FF69B4', width=2, tag="polygon")
 
+    def draw_prediction(self) -> None:
+        # Draw the model prediction hollow and dashed so it can't be mistaken for manual points
+        self.canvas.delete("prediction")
+        if not self.current_prediction or len(self.current_prediction) != 4:
+            return
+
+        display_points = [
+            (pt[0] * self.scale_x + self.get_offset_x(), pt[1] * self.scale_y + self.get_offset_y())
+            for pt in self.current_prediction
+        ]
+        edges = [(0, 1), (1, 2), (2, 3), (3, 0)]
+        for i, j in edges:
+            x1, y1 = display_points[i]
+            x2, y2 = display_points[j]
+            self.canvas.create_line(
+                x1, y1, x2, y2, fill='cyan', width=2, dash=(6, 4), tag="prediction")
+        for x, y in display_points:
+            self.canvas.create_oval(
+                x - self.point_radius, y - self.point_radius,
+                x + self.point_radius, y + self.point_radius,
+                outline='cyan', width=2, tag="prediction")
+
+        confidence = self.predictions.confidences.get(str(self.get_frame_id(self.image_index)))
+        if confidence is not None:
+            x, y = display_points[0]
+            self.canvas.create_text(
+                x, y - self.point_radius - 10, text=f"{confidence:.2f}", fill='cyan',
+                font=('Arial', 10), tag="prediction")
+
     def get_offset_x(self) -> float:
         canvas_width = self.canvas.winfo_width()
         display_width = self.display_image.width
@@ -417,6 +552,8 @@ class ImageLabeler:
         # If not near an existing point, add a new point at the correct index
         if len(self.points) < 4:
             self.points.append([x_original, y_original])
+            # Manual points take over from the prediction overlay
+            self.current_prediction = None
             self.save_current_label()
             self.draw_polygon_and_points()
             self.update_status(f"Added point {len(self.points) - 1}.")
@@ -504,6 +641,7 @@ class ImageLabeler:
                     fid = len(self.labels)
                 self.labels.append({'frame_id': fid, 'label': []})
             self.labels.append(label)
+        self.unsynced_frames.add(self.image_index)
 
     def load_labels(self, event: Optional[tk.Event] = None) -> None:
         # Load labels from a JSON file
@@ -511,35 +649,285 @@ class ImageLabeler:
             title="Select Label File", filetypes=(("JSON files", "*.json"),))
         if label_file:
             with open(label_file, 'r') as f:
-                self.labels = json.load(f)
+                self.labels = self.align_labels(json.load(f))
 
             # Update image_index to match labels if using filenames as IDs
             if self.use_filename_as_id.get():
-                # Create a mapping from image filenames to their indices
-                image_name_to_index = {name: idx for idx, name in enumerate(self.images)}
-                # Create a new labels list with the correct order
-                new_labels = [None] * len(self.images)
-                for label in self.labels:
-                    frame_id = label['frame_id']
-                    if isinstance(frame_id, str):
-                        if frame_id in image_name_to_index:
-                            index = image_name_to_index[frame_id]
-                            new_labels[index] = label
-                        else:
-                            messagebox.showwarning(
-                                "Warning", f"Image {frame_id} not found in folder.")
-                # Replace labels with new_labels, filling in missing labels
-                self.labels = []
-                for idx in range(len(self.images)):
-                    if new_labels[idx]:
-                        self.labels.append(new_labels[idx])
-                    else:
-                        fid = self.images[idx] if self.use_filename_as_id.get() else idx
-                        self.labels.append({'frame_id': fid, 'label': []})
                 self.image_index = 0
+            # Labels from a file are new to the server
+            self.unsynced_frames = set(range(len(self.labels)))
             self.show_image()
             self.update_status("Loaded labels from file.")
 
+    def align_labels(self, labels: List[dict]) -> List[dict]:
+        # Order labels to match self.images when filenames are used as ids
+        if not self.use_filename_as_id.get():
+            return labels
+        # Create a mapping from image filenames to their indices
+        image_name_to_index = {name: idx for idx, name in enumerate(self.images)}
+        # Create a new labels list with the correct order
+        new_labels = [None] * len(self.images)
+        missing = []
+        for label in labels:
+            frame_id = label['frame_id']
+            if isinstance(frame_id, str):
+                if frame_id in image_name_to_index:
+                    new_labels[image_name_to_index[frame_id]] = label
+                else:
+                    missing.append(frame_id)
+        if missing:
+            messagebox.showwarning(
+                "Warning", f"{len(missing)} labeled images not found in folder, e.g. {', '.join(missing[:3])}.")
+        # Fill in missing labels
+        return [new_labels[idx] or {'frame_id': self.images[idx], 'label': []} for idx in range(len(self.images))]
+
+    def connect_label_server(self) -> None:
+        # Connect to a label server running on this machine
+        from tkinter import simpledialog
+        from label_server import LabelClient
+        address = simpledialog.askstring(
+            "Label Server", "Server address (host:port):", initialvalue="127.0.0.1:8765")
+        if not address:
+            return
+        host, _, port = address.rpartition(':')
+        try:
+            client = LabelClient(host or '127.0.0.1', int(port), pool_size=1)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid server address: {e}")
+            return
+        self.update_status("Connecting to label server...")
+
+        def on_connected(progress: Optional[dict], error: Optional[Exception]) -> None:
+            if error:
+                client.close()
+                messagebox.showerror("Error", f"Could not connect to label server: {error}")
+                self.update_status("Could not connect to label server.")
+                return
+            if self.label_client:
+                self.label_client.close()
+            self.label_client = client
+            self.update_status(
+                f"Connected to label server ({progress['labeled']} of {progress['total']} frames labeled).")
+
+        self.register_frames_on_server(client, on_connected)
+
+    def register_frames_on_server(self, client: 'LabelClient',
+                                  on_done: Optional[Callable[[Optional[dict], Optional[Exception]], None]] = None) -> None:
+        # Add every frame of the folder to the server so its progress counts cover the whole dataset
+        dataset = self.get_dataset()
+        frames = [{'frame_id': str(self.get_frame_id(idx)), 'frame_index': idx} for idx in range(len(self.images))]
+
+        def register() -> dict:
+            if frames:
+                client.register_frames(dataset, frames)
+            return client.progress(dataset)
+
+        def report(progress: Optional[dict], error: Optional[Exception]) -> None:
+            if error:
+                self.update_status(f"Label server sync failed: {error}")
+
+        self.submit_sync_job(register, on_done or report)
+
+    def load_labels_from_server(self) -> None:
+        # Fetch labels for the current images from the label server
+        if not self.label_client:
+            messagebox.showwarning("Warning", "Not connected to a label server.")
+            return
+        if not self.images:
+            messagebox.showwarning("Warning", "Select an image folder first.")
+            return
+        client = self.label_client
+        dataset = self.get_dataset()
+        frame_ids = [self.get_frame_id(idx) for idx in range(len(self.images))]
+        self.update_status("Loading labels from server...")
+
+        def on_loaded(server_labels: Optional[List[dict]], error: Optional[Exception]) -> None:
+            if error:
+                messagebox.showerror("Error", f"Could not load labels from server: {error}")
+                return
+            if dataset != self.get_dataset():
+                # The folder changed while the request was in flight
+                return
+            by_id = {label['frame_id']: label['label'] for label in server_labels}
+            self.labels = [{'frame_id': fid, 'label': by_id.get(str(fid), [])} for fid in frame_ids]
+            self.unsynced_frames = set()
+            self.show_image()
+            self.update_status(f"Loaded {sum(1 for label in server_labels if label['label'])} labels from server.")
+
+        self.submit_sync_job(lambda: client.get_labels(dataset, [str(fid) for fid in frame_ids]), on_loaded)
+
+    def submit_sync_job(self, work: Callable[[], object],
+                        on_done: Callable[[object, Optional[Exception]], None]) -> None:
+        # Run work() on the sync thread and call on_done(result, error) back on the Tk thread
+        if self.sync_thread is None:
+            self.sync_thread = threading.Thread(target=self.run_sync_jobs, daemon=True)
+            self.sync_thread.start()
+            self.master.after(100, self.poll_sync_results)
+        self.sync_jobs.put((work, on_done))
+
+    def run_sync_jobs(self) -> None:
+        # Sync thread: must not touch any Tk object
+        while True:
+            job = self.sync_jobs.get()
+            if job is None:
+                break
+            work, on_done = job
+            try:
+                result, error = work(), None
+            except (OSError, RuntimeError, ValueError) as e:
+                result, error = None, e
+            self.sync_results.put((on_done, result, error))
+
+    def poll_sync_results(self) -> None:
+        while True:
+            try:
+                on_done, result, error = self.sync_results.get_nowait()
+            except queue.Empty:
+                break
+            on_done(result, error)
+        self.master.after(100, self.poll_sync_results)
+
+    def stop_sync_worker(self) -> None:
+        # Let queued pushes finish, but don't hang on an unresponsive server
+        if self.sync_thread is not None:
+            self.sync_jobs.put(None)
+            timeout = self.label_client.timeout if self.label_client else 10.0
+            self.sync_thread.join(timeout=timeout)
+            self.sync_thread = None
+
+    def load_predictions(self) -> None:
+        # Load model predictions from a JSON or npz file
+        prediction_file = filedialog.askopenfilename(
+            title="Select Prediction File",
+            filetypes=(("Prediction files", "*.json *.npz"), ("JSON files", "*.json"), ("NumPy archives", "*.npz")))
+        if not prediction_file:
+            return
+        try:
+            predictions = PredictionStore(prediction_file)
+        except (OSError, ValueError, KeyError, TypeError, ImportError) as e:
+            messagebox.showerror("Error", f"Could not load predictions: {e}")
+            return
+        if self.predictions is not None:
+            self.predictions.close()
+        self.predictions = predictions
+        self.review_order = None
+        self.load_rejected_predictions()
+        if self.images:
+            self.show_image()
+        message = f"Loaded {len(predictions)} predictions."
+        if predictions.skipped:
+            message += f" Skipped {predictions.skipped} malformed predictions."
+        self.update_status(message)
+
+    def load_rejected_predictions(self) -> None:
+        # Rejections are kept next to labels.json so a review pass can be resumed.
+        # They only apply to the same image folder and the same prediction file.
+        self.rejected_predictions = set()
+        self.rejection_log = {}
+        if not self.output_folder or self.predictions is None:
+            return
+        rejected_path = os.path.join(self.output_folder, 'rejected_predictions.json')
+        if os.path.isfile(rejected_path):
+            try:
+                with open(rejected_path, 'r') as f:
+                    rejection_log = json.load(f)
+                if not isinstance(rejection_log, dict):
+                    raise ValueError("expected a JSON object")
+                self.rejection_log = rejection_log
+                frame_ids = rejection_log.get(self.get_dataset(), {}).get(self.predictions.fingerprint, [])
+                self.rejected_predictions = {str(fid) for fid in frame_ids}
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                messagebox.showwarning("Warning", f"Could not read rejected predictions: {e}")
+
+    def save_rejected_predictions(self) -> None:
+        if not self.output_folder or self.predictions is None:
+            return
+        dataset_log = self.rejection_log.setdefault(self.get_dataset(), {})
+        dataset_log[self.predictions.fingerprint] = sorted(self.rejected_predictions)
+        rejected_path = os.path.join(self.output_folder, 'rejected_predictions.json')
+        try:
+            with open(rejected_path, 'w') as f:
+                json.dump(self.rejection_log, f, indent=2)
+        except OSError as e:
+            self.update_status(f"Could not save rejected predictions: {e}")
+
+    def accept_prediction(self, event: Optional[tk.Event] = None) -> None:
+        # Copy the prediction into the manual label and move on
+        if not self.current_prediction:
+            self.update_status("No prediction to accept.")
+            return
+        if self.points:
+            self.update_status("Frame already has manual points; reset it to accept the prediction.")
+            return
+        self.points = [list(pt) for pt in self.current_prediction]
+        self.current_prediction = None
+        self.save_current_label()
+        self.draw_polygon_and_points()
+        self.update_status("Accepted prediction.")
+        self.next_prediction()
+
+    def reject_prediction(self, event: Optional[tk.Event] = None) -> None:
+        # Drop the prediction for this frame and move on
+        if not self.current_prediction:
+            self.update_status("No prediction to reject.")
+            return
+        self.rejected_predictions.add(str(self.get_frame_id(self.image_index)))
+        self.save_rejected_predictions()
+        self.current_prediction = None
+        self.draw_polygon_and_points()
+        self.update_status("Rejected prediction.")
+        self.next_prediction()
+
+    def next_prediction(self, event: Optional[tk.Event] = None) -> None:
+        self.step_prediction(1)
+
+    def prev_prediction(self, event: Optional[tk.Event] = None) -> None:
+        self.step_prediction(-1)
+
+    def get_review_order(self) -> List[Tuple[str, int]]:
+        # (frame id, image index) of predicted frames in this folder, by decreasing confidence
+        if self.review_order is None:
+            index_by_id = {str(self.get_frame_id(idx)): idx for idx in range(len(self.images))}
+            self.review_order = [(fid, index_by_id[fid])
+                                 for fid in self.predictions.sorted_frame_ids() if fid in index_by_id]
+            self.review_positions = {fid: pos for pos, (fid, _) in enumerate(self.review_order)}
+        return self.review_order
+
+    def step_prediction(self, step: int) -> None:
+        # Move through unreviewed predictions in order of decreasing confidence
+        if self.predictions is None or not self.images:
+            return
+        order = self.get_review_order()
+        current = str(self.get_frame_id(self.image_index))
+        position = self.review_positions.get(current, -1 if step > 0 else len(order))
+        position += step
+        while 0 <= position < len(order):
+            frame_id, index = order[position]
+            if frame_id not in self.rejected_predictions and not (
+                    index < len(self.labels) and self.labels[index]['label']):
+                self.go_to_image(index)
+                return
+            position += step
+        self.update_status("No more predictions to review.")
+
+    def go_to_image(self, index: int) -> None:
+        self.save_current_label()
+        self.auto_save_labels()
+        self.image_index = index
+        self.show_image()
+
+    def on_frame_ids_changed(self, *args) -> None:
+        self.review_order = None
+        if self.label_client and self.images:
+            self.register_frames_on_server(self.label_client)
+
+    def get_dataset(self) -> str:
+        # Server rows are scoped to the image folder so frame ids from different folders don't collide
+        return os.path.abspath(self.image_folder) if self.image_folder else ''
+
+    def get_frame_id(self, index: int):
+        return self.images[index] if self.use_filename_as_id.get() else index
+
     def save_labels(self, event: Optional[tk.Event] = None) -> None:
         # Save labels to a JSON file (manual save)
         if self.labels:
@@ -584,17 +972,42 @@ class ImageLabeler:
 
     def auto_save_labels(self) -> None:
         # Automatically save labels to the output folder as JSON
-        if self.labels and self.output_folder:
+        if self.auto_save_blocked:
+            self.update_status("Auto-save disabled: the existing labels.json could not be read.")
+        elif self.labels and self.output_folder:
             save_path = os.path.join(self.output_folder, 'labels.json')
             with open(save_path, 'w') as f:
                 json.dump(self.labels, f, indent=2)
             self.update_status("Labels auto-saved.")
+        if self.unsynced_frames and self.label_client:
+            # Push only the frames changed since the last sync, in the background.
+            # Points are copied because dragging keeps mutating the current frame's lists.
+            indices = sorted(idx for idx in self.unsynced_frames if idx < len(self.labels))
+            batch = [{'frame_id': str(self.labels[idx]['frame_id']), 'frame_index': idx,
+                      'label': [list(pt) for pt in self.labels[idx]['label']]} for idx in indices]
+            self.unsynced_frames.clear()
+            client = self.label_client
+            dataset = self.get_dataset()
+
+            def on_synced(written: Optional[int], error: Optional[Exception]) -> None:
+                if error:
+                    # Retry these frames on the next save, unless the folder has changed since
+                    if dataset == self.get_dataset():
+                        self.unsynced_frames.update(indices)
+                    self.update_status(f"Label server sync failed: {error}")
+
+            self.submit_sync_job(lambda: client.put_labels(dataset, batch), on_synced)
 
     def on_closing(self, event: Optional[tk.Event] = None) -> None:
         # Save labels when closing
         self.save_current_label()
         self.auto_save_labels()
         self.update_status("Application closed.")
+        self.stop_sync_worker()
+        if self.label_client:
+            self.label_client.close()
+        if self.predictions is not None:
+            self.predictions.close()
         self.master.destroy()
 
     def update_status(self, message: str) -> None:
@@ -610,7 +1023,7 @@ class ImageLabeler:
         # Create a top-level window for the shortcuts
         shortcuts_window = tk.Toplevel(self.master)
         shortcuts_window.title("Keyboard Shortcuts")
-        shortcuts_window.geometry("400x300")
+        shortcuts_window.geometry("400x380")
         shortcuts_window.resizable(False, False)
 
         # Add a Text widget with the shortcuts
@@ -626,6 +1039,9 @@ class ImageLabeler:
             "c:\tToggle Copy Previous\n"
             "u:\tToggle Use Image Filename as ID\n"
             "l:\tLoad Saved Labels\n"
+            "y:\tAccept Prediction\n"
+            "x:\tReject Prediction\n"
+            ". or ,:\tNext/Previous Prediction by Confidence\n"
             "q or Esc:\tQuit Application\n\n"
             "Mouse Actions:\n"
             "Right Click on Image:\tSave Labels, without prompt\n"
@@ -637,8 +1053,44 @@ class ImageLabeler:
     def show_about(self) -> None:
         messagebox.showinfo("About", "Image Labeler\nVersion 1.0\n\nBy, Pronay Sarkar\nhttps://github.com/rain194")
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Label trapezoids on a folder of images")
+    parser.add_argument('image_folder', nargs='?', default='',
+                        help="Folder of images to label; skips the welcome screen")
+    parser.add_argument('output_folder', nargs='?', default='',
+                        help="Folder where labels.json is auto-saved")
+    parser.add_argument('--start', type=int, default=0, help="Index of the first image to show (0-based)")
+    parser.add_argument('--prefix', default='', help="Only load images whose name starts with this prefix")
+    parser.add_argument('--extension', default='', help="Only load images with this extension")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Print the wall-clock time at which the first frame is drawn, then exit")
+    args = parser.parse_args()
+
+    if args.image_folder and not os.path.isdir(args.image_folder):
+        parser.error(f"Image folder not found: {args.image_folder}")
+    if args.image_folder and not args.output_folder:
+        parser.error("An output folder is required when an image folder is given.")
+    if args.output_folder and not os.path.isdir(args.output_folder):
+        parser.error(f"Output folder not found: {args.output_folder}")
+    if args.benchmark and not args.image_folder:
+        parser.error("--benchmark requires an image folder and an output folder.")
+    if args.benchmark and not find_images(args.image_folder, args.prefix, args.extension):
+        # Fail instead of opening a modal dialog nobody will dismiss
+        print(f"No images found in {args.image_folder} with the specified criteria.", file=sys.stderr)
+        sys.exit(1)
+    return args
+
+
 if __name__ == '__main__':
+    args = parse_args()
     root = tk.Tk()
-    app = ImageLabeler(root)
+    app = ImageLabeler(root, args.image_folder, args.output_folder, args.start, args.prefix, args.extension)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    if args.benchmark:
+        def report_startup() -> None:
+            root.update_idletasks()
+            # Epoch time, so bench_startup.py can measure from before the interpreter started
+            print(f"First frame drawn at {time.time():.6f}")
+            root.destroy()
+        app.on_first_frame = report_startup
     root.mainloop()
@@ -0,0 +1,400 @@
+import asyncio
+import argparse
+import http.client
+import json
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BATCH = 10000  # Upper bound on rows returned by a single read
+SQLITE_INT_MIN, SQLITE_INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def validate_rows(rows: object, prelabels: bool = False, frames_only: bool = False) -> List[dict]:
+    # Reject payloads SQLite would choke on before they reach the database
+    if not isinstance(rows, list):
+        raise ValueError("Expected a JSON list of rows.")
+    for row in rows:
+        if not isinstance(row, dict):
+            raise ValueError("Each row must be a JSON object.")
+        if 'frame_id' not in row or not isinstance(row['frame_id'], (str, int)) or isinstance(row['frame_id'], bool):
+            raise ValueError("Each row needs a string or integer 'frame_id'.")
+        if not frames_only and not isinstance(row.get('label'), list):
+            raise ValueError(f"Row {row['frame_id']}: 'label' must be a list of points.")
+        frame_index = row.get('frame_index')
+        if frame_index is not None and (
+                not isinstance(frame_index, int) or isinstance(frame_index, bool)
+                or not SQLITE_INT_MIN <= frame_index <= SQLITE_INT_MAX):
+            raise ValueError(f"Row {row['frame_id']}: 'frame_index' must be a 64-bit integer.")
+        if prelabels:
+            confidence = row.get('confidence')
+            if confidence is not None and (
+                    not isinstance(confidence, (int, float)) or isinstance(confidence, bool)
+                    or math.isnan(confidence)):
+                raise ValueError(f"Row {row['frame_id']}: 'confidence' must be a number.")
+    return rows
+
+
+class LabelStore:
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        # Every per-thread connection, so close() can release those opened by executor threads too
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        # Create the schema once; WAL lets readers proceed while a batch is written.
+        # Rows are keyed by dataset (the image folder) so frame ids from different folders don't collide.
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS labels (
+                dataset TEXT NOT NULL,
+                frame_id TEXT NOT NULL,
+                frame_index INTEGER,
+                label TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (dataset, frame_id)
+            );
+            CREATE INDEX IF NOT EXISTS labels_frame_index ON labels(dataset, frame_index);
+            CREATE TABLE IF NOT EXISTS prelabels (
+                dataset TEXT NOT NULL,
+                frame_id TEXT NOT NULL,
+                label TEXT NOT NULL,
+                confidence REAL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (dataset, frame_id)
+            );
+            CREATE INDEX IF NOT EXISTS prelabels_confidence ON prelabels(dataset, confidence);
+            """
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, since sqlite3 connections are not shareable
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Each connection is only used by its own thread; close() may run on another one
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def put_labels(self, dataset: str, labels: List[dict]) -> int:
+        # Upsert a batch of {'frame_id', 'label', optional 'frame_index'} in one transaction
+        validate_rows(labels)
+        now = time.time()
+        rows = [
+            (dataset, str(label['frame_id']), label.get('frame_index'), json.dumps(label['label']), now)
+            for label in labels
+        ]
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO labels (dataset, frame_id, frame_index, label, updated) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(dataset, frame_id) DO UPDATE SET "
+                    "frame_index=COALESCE(excluded.frame_index, frame_index), "
+                    "label=excluded.label, updated=excluded.updated",
+                    rows)
+        return len(rows)
+
+    def get_labels(self, dataset: str, frame_ids: Optional[List[str]] = None,
+                   offset: int = 0, limit: int = MAX_BATCH) -> List[dict]:
+        # Read the given frames, or a page of all frames ordered by frame index
+        if offset < 0:
+            raise ValueError("'offset' must not be negative.")
+        conn = self._connection()
+        if frame_ids is not None:
+            result = []
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(frame_ids), 500):
+                chunk = frame_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                result.extend(conn.execute(
+                    "SELECT frame_id, frame_index, label FROM labels "
+                    f"WHERE dataset = ? AND frame_id IN ({placeholders})",
+                    [dataset, *chunk]).fetchall())
+        else:
+            result = conn.execute(
+                "SELECT frame_id, frame_index, label FROM labels WHERE dataset = ? "
+                "ORDER BY frame_index, frame_id LIMIT ? OFFSET ?",
+                (dataset, max(0, min(limit, MAX_BATCH)), offset)).fetchall()
+        return [{'frame_id': fid, 'frame_index': idx, 'label': json.loads(label)}
+                for fid, idx, label in result]
+
+    def put_prelabels(self, dataset: str, prelabels: List[dict]) -> int:
+        # Upsert model predictions: {'frame_id', 'label', optional 'confidence'}
+        validate_rows(prelabels, prelabels=True)
+        now = time.time()
+        rows = [
+            (dataset, str(p['frame_id']), json.dumps(p['label']), p.get('confidence'), now)
+            for p in prelabels
+        ]
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO prelabels (dataset, frame_id, label, confidence, updated) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(dataset, frame_id) DO UPDATE SET "
+                    "label=excluded.label, confidence=excluded.confidence, updated=excluded.updated",
+                    rows)
+        return len(rows)
+
+    def get_prelabels(self, dataset: str, frame_ids: List[str]) -> List[dict]:
+        conn = self._connection()
+        result = []
+        for start in range(0, len(frame_ids), 500):
+            chunk = frame_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            result.extend(conn.execute(
+                "SELECT frame_id, label, confidence FROM prelabels "
+                f"WHERE dataset = ? AND frame_id IN ({placeholders})",
+                [dataset, *chunk]).fetchall())
+        return [{'frame_id': fid, 'label': json.loads(label), 'confidence': conf}
+                for fid, label, conf in result]
+
+    def register_frames(self, dataset: str, frames: List[dict]) -> int:
+        # Add unlabeled rows for {'frame_id', optional 'frame_index'} so progress covers the whole dataset;
+        # frames that already have a row keep their label
+        validate_rows(frames, frames_only=True)
+        now = time.time()
+        rows = [(dataset, str(frame['frame_id']), frame.get('frame_index'), now) for frame in frames]
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO labels (dataset, frame_id, frame_index, label, updated) VALUES (?, ?, ?, '[]', ?) "
+                    "ON CONFLICT(dataset, frame_id) DO UPDATE SET "
+                    "frame_index=COALESCE(frame_index, excluded.frame_index)",
+                    rows)
+        return len(rows)
+
+    def progress(self, dataset: str) -> dict:
+        # A frame counts as labeled once it has all 4 points
+        conn = self._connection()
+        total, labeled = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(json_array_length(label) = 4), 0) FROM labels WHERE dataset = ?",
+            (dataset,)).fetchone()
+        prelabeled = conn.execute(
+            "SELECT COUNT(*) FROM prelabels WHERE dataset = ?", (dataset,)).fetchone()[0]
+        return {'total': total, 'labeled': labeled, 'prelabeled': prelabeled}
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class LabelServer:
+    def __init__(self, store: LabelStore, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self.store = store
+        self.host = host
+        self.port = port
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        # Pick up the real port when started with port 0
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Serve requests on one keep-alive connection until the client closes it
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.dispatch(method, target, body)
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {http.client.responses.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        dataset = query.get('dataset', [''])[0]
+        try:
+            payload = json.loads(body) if body else None
+            # SQLite calls block, so run them off the event loop
+            if url.path == '/labels' and method == 'GET':
+                frame_ids = query.get('frame_id')
+                offset = int(query.get('offset', ['0'])[0])
+                limit = int(query.get('limit', [str(MAX_BATCH)])[0])
+                return 200, await asyncio.to_thread(self.store.get_labels, dataset, frame_ids, offset, limit)
+            if url.path == '/labels' and method == 'POST':
+                return 200, {'written': await asyncio.to_thread(self.store.put_labels, dataset, payload)}
+            if url.path == '/prelabels' and method == 'GET':
+                return 200, await asyncio.to_thread(self.store.get_prelabels, dataset, query.get('frame_id', []))
+            if url.path == '/prelabels' and method == 'POST':
+                return 200, {'written': await asyncio.to_thread(self.store.put_prelabels, dataset, payload)}
+            if url.path == '/frames' and method == 'POST':
+                return 200, {'written': await asyncio.to_thread(self.store.register_frames, dataset, payload)}
+            if url.path == '/progress' and method == 'GET':
+                return 200, await asyncio.to_thread(self.store.progress, dataset)
+        except (KeyError, TypeError, ValueError,
+                OverflowError, sqlite3.IntegrityError, sqlite3.ProgrammingError, sqlite3.InterfaceError) as e:
+            return 400, {'error': str(e)}
+        except sqlite3.Error as e:
+            return 500, {'error': str(e)}
+        return 404, {'error': f"No route for {method} {url.path}"}
+
+
+class LabelClient:
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 pool_size: int = 4, timeout: float = 10.0) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        # Keep-alive connections reused across requests
+        self._pool: 'queue.LifoQueue[http.client.HTTPConnection]' = queue.LifoQueue(maxsize=pool_size)
+
+    def _request(self, method: str, path: str, payload: Optional[object] = None) -> object:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        try:
+            conn = self._pool.get_nowait()
+            pooled = True
+        except queue.Empty:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            pooled = False
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = json.loads(response.read())
+        except (ConnectionError, http.client.BadStatusLine):
+            conn.close()
+            if not pooled:
+                raise
+            # The server closed this keep-alive connection (e.g. it restarted); retry once on a fresh one.
+            # Every endpoint is a read or an upsert, so repeating the request is safe.
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = json.loads(response.read())
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+        if response.status != 200:
+            raise RuntimeError(data.get('error', f"HTTP {response.status}"))
+        return data
+
+    def get_labels(self, dataset: str, frame_ids: Optional[List[str]] = None,
+                   offset: int = 0, limit: int = MAX_BATCH) -> List[dict]:
+        if frame_ids is not None:
+            result = []
+            # Keep request lines short for large batches
+            for start in range(0, len(frame_ids), 200):
+                query = urlencode([('dataset', dataset)] +
+                                  [('frame_id', str(fid)) for fid in frame_ids[start:start + 200]])
+                result.extend(self._request('GET', f"/labels?{query}"))
+            return result
+        query = urlencode({'dataset': dataset, 'offset': offset, 'limit': limit})
+        return self._request('GET', f"/labels?{query}")
+
+    def put_labels(self, dataset: str, labels: List[dict]) -> int:
+        # Large batches go out in MAX_BATCH chunks so no single request holds the write lock for long
+        path = f"/labels?{urlencode({'dataset': dataset})}"
+        return sum(self._request('POST', path, labels[start:start + MAX_BATCH])['written']
+                   for start in range(0, len(labels), MAX_BATCH))
+
+    def get_prelabels(self, dataset: str, frame_ids: List[str]) -> List[dict]:
+        result = []
+        for start in range(0, len(frame_ids), 200):
+            query = urlencode([('dataset', dataset)] +
+                              [('frame_id', str(fid)) for fid in frame_ids[start:start + 200]])
+            result.extend(self._request('GET', f"/prelabels?{query}"))
+        return result
+
+    def put_prelabels(self, dataset: str, prelabels: List[dict]) -> int:
+        return self._request('POST', f"/prelabels?{urlencode({'dataset': dataset})}", prelabels)['written']
+
+    def register_frames(self, dataset: str, frames: List[dict]) -> int:
+        path = f"/frames?{urlencode({'dataset': dataset})}"
+        return sum(self._request('POST', path, frames[start:start + MAX_BATCH])['written']
+                   for start in range(0, len(frames), MAX_BATCH))
+
+    def progress(self, dataset: str) -> dict:
+        return self._request('GET', f"/progress?{urlencode({'dataset': dataset})}")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local label server backed by SQLite")
+    parser.add_argument('--db', default='labels.db', help="SQLite database file")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    store = LabelStore(os.path.abspath(args.db))
+    server = LabelServer(store, args.host, args.port)
+    print(f"Serving labels from {args.db} on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import json
+import math
+import os
+from typing import Dict, List, Optional
+
+
+def valid_confidence(confidence: object) -> bool:
+    if confidence is None:
+        return True
+    return isinstance(confidence, (int, float)) and not isinstance(confidence, bool) and not math.isnan(confidence)
+
+
+def valid_points(points: object) -> bool:
+    # A trapezoid is exactly 4 numeric (x, y) points
+    if not isinstance(points, list) or len(points) != 4:
+        return False
+    return all(
+        isinstance(pt, (list, tuple)) and len(pt) == 2
+        and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in pt)
+        for pt in points)
+
+
+class PredictionStore:
+    # Model predictions indexed by frame id; points are only materialised when a frame is shown
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # Identifies this version of the prediction file; changes when a retrained model overwrites it
+        stat = os.stat(path)
+        self.fingerprint: str = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        self.confidences: Dict[str, Optional[float]] = {}
+        self.skipped: int = 0  # Malformed predictions dropped at load
+        self._rows: Dict[str, int] = {}
+        self._cache: Dict[str, List[List[float]]] = {}
+        self._entries: Optional[list] = None
+        self._npz = None
+        self._npz_labels = None
+
+        try:
+            if path.lower().endswith('.npz'):
+                self._index_npz()
+            else:
+                self._index_json()
+        except Exception:
+            self.close()
+            raise
+
+        # Highest confidence first; predictions without a confidence go last
+        self._order: List[str] = sorted(
+            self._rows,
+            key=lambda fid: -self.confidences[fid] if self.confidences[fid] is not None else float('inf'))
+
+    def _index_json(self) -> None:
+        # Expects a list of {'frame_id', 'label', optional 'confidence'} like labels.json
+        with open(self.path, 'r') as f:
+            self._entries = json.load(f)
+        if not isinstance(self._entries, list):
+            raise ValueError("Prediction file must contain a list of predictions.")
+        for row, entry in enumerate(self._entries):
+            if (not isinstance(entry, dict) or not isinstance(entry.get('frame_id'), (str, int))
+                    or not valid_points(entry.get('label')) or not valid_confidence(entry.get('confidence'))):
+                self.skipped += 1
+                continue
+            frame_id = str(entry['frame_id'])
+            self._rows[frame_id] = row
+            self.confidences[frame_id] = entry.get('confidence')
+
+    def _index_npz(self) -> None:
+        # Expects arrays 'frame_ids' (N,), 'labels' (N, 4, 2) and optional 'confidences' (N,)
+        import numpy as np
+        self._npz = np.load(self.path, allow_pickle=False)
+        for name in ('frame_ids', 'labels'):
+            if name not in self._npz.files:
+                raise ValueError(f"Prediction archive is missing '{name}'.")
+
+        # Check the labels shape from the array header without decompressing the data
+        with self._npz.zip.open('labels.npy') as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape = np.lib.format.read_array_header_1_0(f)[0]
+            else:
+                shape = np.lib.format.read_array_header_2_0(f)[0]
+        frame_ids = self._npz['frame_ids'].tolist()
+        if len(shape) != 3 or shape[1:] != (4, 2) or shape[0] != len(frame_ids):
+            raise ValueError(f"'labels' must have shape ({len(frame_ids)}, 4, 2), got {shape}.")
+
+        confidences = self._npz['confidences'].tolist() if 'confidences' in self._npz.files else None
+        if confidences is not None and len(confidences) != len(frame_ids):
+            raise ValueError("'confidences' must have one value per frame.")
+        for row, frame_id in enumerate(frame_ids):
+            confidence = confidences[row] if confidences is not None else None
+            if not valid_confidence(confidence):
+                self.skipped += 1
+                continue
+            frame_id = str(frame_id)
+            self._rows[frame_id] = row
+            self.confidences[frame_id] = confidence
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, frame_id: object) -> bool:
+        return str(frame_id) in self._rows
+
+    def get(self, frame_id: object) -> Optional[List[List[float]]]:
+        frame_id = str(frame_id)
+        if frame_id not in self._rows:
+            return None
+        if frame_id not in self._cache:
+            row = self._rows[frame_id]
+            if self._npz is not None:
+                # NpzFile decompresses on every key access, so keep the labels array once read
+                if self._npz_labels is None:
+                    self._npz_labels = self._npz['labels']
+                points = self._npz_labels[row].tolist()
+            else:
+                points = self._entries[row]['label']
+            self._cache[frame_id] = [[float(pt[0]), float(pt[1])] for pt in points]
+        return [list(pt) for pt in self._cache[frame_id]]
+
+    def sorted_frame_ids(self) -> List[str]:
+        return list(self._order)
+
+    def close(self) -> None:
+        if self._npz is not None:
+            self._npz.close()
+            self._npz = None
+            self._npz_labels = None
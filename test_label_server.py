@@ -0,0 +1,126 @@
+import asyncio
+import socket
+import sqlite3
+import threading
+
+import pytest
+
+from label_server import LabelClient, LabelServer, LabelStore
+
+
+@pytest.fixture
+def client(tmp_path):
+    # Run the server on an ephemeral localhost port in a background event loop
+    store = LabelStore(str(tmp_path / 'labels.db'))
+    server = LabelServer(store, port=0)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    client = LabelClient(port=server.port)
+    yield client
+
+    client.close()
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+    store.close()
+
+
+def make_labels(count):
+    return [{'frame_id': str(i), 'frame_index': i, 'label': [[i, i]] * (4 if i % 2 else 2)}
+            for i in range(count)]
+
+
+def test_put_get_round_trip(client):
+    assert client.put_labels('a', make_labels(10)) == 10
+    labels = client.get_labels('a', ['1', '3', 'missing'])
+    assert sorted(label['frame_id'] for label in labels) == ['1', '3']
+    assert labels[0]['label'] == [[int(labels[0]['frame_id'])] * 2] * 4
+
+
+def test_datasets_do_not_collide(client):
+    client.put_labels('a', [{'frame_id': '0', 'label': [[1, 1]]}])
+    client.put_labels('b', [{'frame_id': '0', 'label': [[2, 2]]}])
+    assert client.get_labels('a', ['0'])[0]['label'] == [[1, 1]]
+    assert client.get_labels('b', ['0'])[0]['label'] == [[2, 2]]
+
+
+def test_paging(client):
+    client.put_labels('a', make_labels(25))
+    page = client.get_labels('a', offset=10, limit=10)
+    assert [label['frame_index'] for label in page] == list(range(10, 20))
+    assert client.get_labels('a', offset=20, limit=10)[-1]['frame_index'] == 24
+
+
+def test_negative_limit_is_clamped(client):
+    client.put_labels('a', make_labels(5))
+    assert client.get_labels('a', limit=-1) == []
+    with pytest.raises(RuntimeError):
+        client.get_labels('a', offset=-1)
+
+
+def test_progress(client):
+    client.put_labels('a', make_labels(10))
+    client.put_prelabels('a', [{'frame_id': '0', 'label': [[0, 0]] * 4, 'confidence': 0.5}])
+    assert client.progress('a') == {'total': 10, 'labeled': 5, 'prelabeled': 1}
+    assert client.progress('b') == {'total': 0, 'labeled': 0, 'prelabeled': 0}
+
+
+def test_registered_frames_count_towards_progress(client):
+    client.put_labels('a', [{'frame_id': '1', 'frame_index': 1, 'label': [[0, 0]] * 4}])
+    assert client.register_frames('a', [{'frame_id': str(i), 'frame_index': i} for i in range(5)]) == 5
+    assert client.progress('a') == {'total': 5, 'labeled': 1, 'prelabeled': 0}
+    # Registering does not overwrite existing labels
+    assert client.get_labels('a', ['1'])[0]['label'] == [[0, 0]] * 4
+
+
+def test_prelabels(client):
+    client.put_prelabels('a', [
+        {'frame_id': '7', 'label': [[1, 2]] * 4, 'confidence': 0.9},
+        {'frame_id': '8', 'label': [[3, 4]] * 4},
+    ])
+    prelabels = {p['frame_id']: p for p in client.get_prelabels('a', ['7', '8'])}
+    assert prelabels['7']['confidence'] == 0.9
+    assert prelabels['8']['confidence'] is None
+    assert prelabels['8']['label'] == [[3, 4]] * 4
+
+
+@pytest.mark.parametrize('payload', [
+    {'frame_id': '0'},
+    [{'label': []}],
+    [{'frame_id': '0', 'label': [], 'frame_index': {}}],
+    [{'frame_id': '0', 'label': 'abc'}],
+    [{'frame_id': 'z', 'label': [[1, 2]], 'frame_index': 2 ** 70}],
+])
+def test_bad_payload_returns_400(client, payload):
+    with pytest.raises(RuntimeError):
+        client._request('POST', '/labels?dataset=a', payload)
+    # The connection survives a rejected request
+    assert client.progress('a')['total'] == 0
+
+
+def test_stale_pooled_connection_is_retried(client):
+    client.progress('a')
+    # Simulate an idle keep-alive connection that can no longer be used
+    conn = client._pool.get_nowait()
+    conn.sock.shutdown(socket.SHUT_RDWR)
+    client._pool.put_nowait(conn)
+    assert client.progress('a')['total'] == 0
+
+
+def test_store_close_releases_all_thread_connections(tmp_path):
+    store = LabelStore(str(tmp_path / 'labels.db'))
+    threads = [threading.Thread(target=store.progress, args=('a',)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    connections = list(store._connections)
+    assert len(connections) == 4
+    store.close()
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
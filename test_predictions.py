@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from predictions import PredictionStore
+
+TRAPEZOID = [[0, 0], [10, 0], [8, 5], [2, 5]]
+
+
+def write_json(tmp_path, entries):
+    path = tmp_path / 'predictions.json'
+    path.write_text(json.dumps(entries))
+    return str(path)
+
+
+def test_json_indexing(tmp_path):
+    store = PredictionStore(write_json(tmp_path, [
+        {'frame_id': 'a.png', 'label': TRAPEZOID, 'confidence': 0.3},
+        {'frame_id': 2, 'label': TRAPEZOID, 'confidence': 0.9},
+    ]))
+    assert len(store) == 2
+    assert 'a.png' in store and 2 in store and '2' in store
+    assert store.get('a.png') == [[float(x), float(y)] for x, y in TRAPEZOID]
+    assert store.confidences['2'] == 0.9
+
+
+def test_get_missing_id(tmp_path):
+    store = PredictionStore(write_json(tmp_path, [{'frame_id': 'a', 'label': TRAPEZOID}]))
+    assert store.get('b') is None
+    assert 'b' not in store
+
+
+def test_get_returns_a_copy(tmp_path):
+    store = PredictionStore(write_json(tmp_path, [{'frame_id': 'a', 'label': TRAPEZOID}]))
+    store.get('a')[0][0] = 99
+    assert store.get('a')[0][0] == 0.0
+
+
+def test_sorted_frame_ids(tmp_path):
+    store = PredictionStore(write_json(tmp_path, [
+        {'frame_id': 'none', 'label': TRAPEZOID},
+        {'frame_id': 'low', 'label': TRAPEZOID, 'confidence': 0.1},
+        {'frame_id': 'high', 'label': TRAPEZOID, 'confidence': 0.9},
+        {'frame_id': 'mid', 'label': TRAPEZOID, 'confidence': 0.5},
+    ]))
+    assert store.sorted_frame_ids() == ['high', 'mid', 'low', 'none']
+
+
+def test_malformed_entries_are_skipped(tmp_path):
+    store = PredictionStore(write_json(tmp_path, [
+        {'frame_id': 'ok', 'label': TRAPEZOID, 'confidence': 0.5},
+        {'frame_id': 'three', 'label': TRAPEZOID[:3], 'confidence': 0.99},
+        {'frame_id': 'text', 'label': TRAPEZOID, 'confidence': 'high'},
+        {'frame_id': 'nan', 'label': TRAPEZOID, 'confidence': float('nan')},
+        {'label': TRAPEZOID},
+        'not a dict',
+    ]))
+    assert store.sorted_frame_ids() == ['ok']
+    assert store.skipped == 5
+
+
+def test_top_level_must_be_a_list(tmp_path):
+    with pytest.raises(ValueError):
+        PredictionStore(write_json(tmp_path, {'frame_id': 'a', 'label': TRAPEZOID}))
+
+
+def test_npz_indexing(tmp_path):
+    np = pytest.importorskip('numpy')
+    path = str(tmp_path / 'predictions.npz')
+    np.savez(path, frame_ids=np.array(['x', 'y', 'z']), labels=np.arange(24, dtype=float).reshape(3, 4, 2),
+             confidences=np.array([0.2, np.nan, 0.7]))
+    store = PredictionStore(path)
+    assert store.sorted_frame_ids() == ['z', 'x']
+    assert store.skipped == 1
+    assert store.get('z') == [[16.0, 17.0], [18.0, 19.0], [20.0, 21.0], [22.0, 23.0]]
+    assert store.get('y') is None
+    store.close()
+
+
+def test_npz_wrong_shape(tmp_path):
+    np = pytest.importorskip('numpy')
+    path = str(tmp_path / 'predictions.npz')
+    np.savez(path, frame_ids=np.array(['x']), labels=np.zeros((1, 3, 2)))
+    with pytest.raises(ValueError):
+        PredictionStore(path)
+
+
+def test_fingerprint_changes_when_file_is_replaced(tmp_path):
+    path = write_json(tmp_path, [{'frame_id': 'a', 'label': TRAPEZOID}])
+    first = PredictionStore(path).fingerprint
+    assert PredictionStore(path).fingerprint == first
+    write_json(tmp_path, [{'frame_id': 'a', 'label': TRAPEZOID, 'confidence': 0.5}])
+    assert PredictionStore(path).fingerprint != first